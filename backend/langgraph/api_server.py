@@ -39,6 +39,7 @@ from fastapi import Response
 from fastapi import FastAPI, HTTPException
 from fastapi import APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from pathlib import Path
@@ -356,6 +357,93 @@ def chat(req: ChatRequest):
         )
 
 
+def _sse_frame(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def _message_text(content) -> str:
+    """Flatten a message content (str or list-of-parts) to plain text."""
+    if isinstance(content, str):
+        return content
+    if content:
+        return "".join(
+            x if isinstance(x, str) else x.get("text", "")
+            for x in content
+        )
+    return ""
+
+
+@router.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """Stream a chat turn as Server-Sent Events.
+
+    Emits token events as the model produces them plus tool_end markers, so
+    browser clients render the response at first-token latency instead of
+    waiting for the whole turn. Ends with a 'done' frame carrying the
+    session id.
+    """
+    ensure_agent_initialized()
+
+    actual_session_id = setup_user_session(req.email, req.session_id)
+    backend.current_api_session_id = actual_session_id
+    config = {"configurable": {"thread_id": actual_session_id}}
+
+    async def event_gen():
+        response_parts: List[str] = []
+        final_text = ""
+        try:
+            async for event in _app_graph.astream_events(
+                {"messages": [backend.HumanMessage(content=req.message)]},
+                config,
+                version="v2",
+            ):
+                kind = event.get("event")
+                # Only the events a client can render are forwarded; full
+                # graph state stays server-side.
+                if kind == "on_chat_model_stream":
+                    chunk = event.get("data", {}).get("chunk")
+                    text = _message_text(getattr(chunk, "content", "") or "")
+                    if text:
+                        response_parts.append(text)
+                        yield _sse_frame({"type": "token", "content": text})
+                elif kind == "on_chat_model_end":
+                    # A generation can arrive without stream chunks (e.g. an
+                    # LLM-cache hit returns the full message at once); keep
+                    # the last complete output as the fallback.
+                    output = event.get("data", {}).get("output")
+                    text = _message_text(getattr(output, "content", "") or "")
+                    if text:
+                        final_text = text
+                elif kind == "on_tool_end":
+                    yield _sse_frame({"type": "tool_end", "name": event.get("name", "unknown")})
+
+            response_text = "".join(response_parts)
+            if not response_text and final_text:
+                # Non-streamed generation: the client never saw tokens, so
+                # deliver the full text in one frame.
+                response_text = final_text
+                yield _sse_frame({"type": "token", "content": response_text})
+
+            if actual_session_id not in backend.chatmap:
+                backend.chatmap[actual_session_id] = backend.InMemoryChatMessageHistory()
+            backend.chatmap[actual_session_id].add_message(backend.HumanMessage(content=req.message))
+            # Never record a placeholder as a real AI turn; an empty
+            # generation just leaves no AI message in history.
+            if response_text:
+                backend.chatmap[actual_session_id].add_message(backend.AIMessage(content=response_text))
+            backend.request_save()
+
+            yield _sse_frame({"type": "done", "session_id": actual_session_id})
+        except Exception as e:
+            yield _sse_frame({"type": "error", "error": str(e)})
+
+    return StreamingResponse(
+        event_gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/session", response_model=SessionCreateResponse)
 def create_session(req: SessionCreateRequest):
     ensure_agent_initialized()
@@ -4,8 +4,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
 
+# Serialize HTTP responses with orjson when available; stdlib JSON otherwise.
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as _ResponseClass
+
 # --- Initialization ---
-app = FastAPI(title="Luna Agent Thoughts Streamer")
+app = FastAPI(title="Luna Agent Thoughts Streamer", default_response_class=_ResponseClass)
 
 # Allow Cross-Origin Resource Sharing (CORS) so your frontend can connect
 app.add_middleware(
@@ -20,11 +27,18 @@ app.add_middleware(
 class ConnectionManager:
     def __init__(self):
         self.active_connection: Optional[WebSocket] = None
+        # Outbound thoughts are queued and drained by a single sender task, so
+        # producers never wait on the WebSocket write and bursts of thoughts
+        # are coalesced into one frame per tick.
+        self._outq: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._drain_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         """Accept and store the one active WebSocket connection."""
         await websocket.accept()
         self.active_connection = websocket
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
         print("✅ Frontend connected to thoughts stream.")
 
     def disconnect(self):
@@ -33,10 +47,30 @@ class ConnectionManager:
         print("🔌 Frontend disconnected from thoughts stream.")
 
     async def broadcast(self, message: str):
-        """Send a message to the active frontend connection if it exists."""
-        if self.active_connection:
+        """Queue a message for the frontend; never blocks the producer."""
+        if self.active_connection is None:
+            return
+        try:
+            self._outq.put_nowait(message)
+        except asyncio.QueueFull:
+            # Drop the oldest thought to keep the stream fresh under bursts.
             try:
-                await self.active_connection.send_text(message)
+                self._outq.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._outq.put_nowait(message)
+
+    async def _drain(self):
+        """Sender task: coalesce queued thoughts into as few sends as possible."""
+        while True:
+            message = await self._outq.get()
+            while not self._outq.empty():
+                message += "\n" + self._outq.get_nowait()
+            ws = self.active_connection
+            if ws is None:
+                continue
+            try:
+                await ws.send_text(message)
             except Exception as e:
                 # This might happen if the frontend closes the tab abruptly
                 print(f"Error sending thought, connection might be closed: {e}")
@@ -63,6 +97,23 @@ async def websocket_endpoint(websocket: WebSocket):
     except WebSocketDisconnect:
         manager.disconnect()
 
+@app.websocket("/ws/thought_in")
+async def thought_ingest(websocket: WebSocket):
+    """
+    Direct ingest channel for the agent: each thought arrives as a plain
+    WebSocket frame and is forwarded straight to the frontend, skipping the
+    per-thought HTTP POST overhead (headers, routing, Pydantic validation).
+    POST /thought below remains as a fallback.
+    """
+    await websocket.accept()
+    print("✅ Agent connected to thought ingest stream.")
+    try:
+        while True:
+            step = await websocket.receive_text()
+            await manager.broadcast(step)
+    except WebSocketDisconnect:
+        print("🔌 Agent disconnected from thought ingest stream.")
+
 @app.post("/thought")
 async def post_thought(thought: Thought):
     """
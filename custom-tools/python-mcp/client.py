@@ -6,31 +6,59 @@ Uses the  server to control Chrome tabs
 
 import asyncio
 import json
+import re
 import websockets
 import uuid
 from typing import Dict, Any, Optional, List
 
+# Prefer orjson for the per-frame envelope encode/decode; fall back to the
+# stdlib so the dependency stays optional. With orjson, dumps returns bytes
+# and frames go out as BINARY, skipping the UTF-8 text-frame validation on
+# both sides of the client-server leg; the server's loads accepts bytes.
+try:
+    import orjson
+
+    dumps = orjson.dumps
+    loads = orjson.loads
+except ImportError:
+    dumps = json.dumps
+    loads = json.loads
+
 class ChromeTabController:
+    __slots__ = ('server_url', 'websocket', 'pending_requests',
+                 '_deadlines', '_send_q', '_loop', '_tasks')
+
     def __init__(self, server_url='ws://localhost:8765/ws'):
         self.server_url = server_url
         self.websocket = None
         self.pending_requests = {}
+        self._deadlines = {}
+        self._send_q = asyncio.Queue()
+        self._loop = None
+        self._tasks = []
 
     async def connect(self):
         """Connect to the  server"""
         try:
-            self.websocket = await websockets.connect(self.server_url)
+            self._loop = asyncio.get_running_loop()
+            # compression=None mirrors the server: no zlib on tiny envelopes
+            self.websocket = await websockets.connect(self.server_url, compression=None)
 
             # Identify as a client
-            await self.websocket.send(json.dumps({
+            await self.websocket.send(dumps({
                 'type': 'role',
                 'role': 'client'
             }))
 
             print("Connected to  Chrome Server")
 
-            # Start message handler
-            asyncio.create_task(self._message_handler())
+            # Start message handler, timeout sweeper and writer. Keeping
+            # references stops the loop's weak task set from GC-ing them.
+            self._tasks = [
+                asyncio.create_task(self._message_handler(), name="ws-handler"),
+                asyncio.create_task(self._sweep_expired(), name="ws-sweeper"),
+                asyncio.create_task(self._writer(), name="ws-writer"),
+            ]
 
         except Exception as e:
             print(f"Failed to connect: {e}")
@@ -38,14 +66,20 @@ class ChromeTabController:
 
     async def _message_handler(self):
         """Handle incoming messages from the server"""
+        # Hoist the bound methods out of the receive loop; one attribute
+        # lookup per connection instead of two per message
+        pop_pending = self.pending_requests.pop
+        pop_deadline = self._deadlines.pop
         try:
             async for message in self.websocket:
-                data = json.loads(message)
-                request_id = data.get('id')
-
-                if request_id in self.pending_requests:
-                    future = self.pending_requests.pop(request_id)
-                    future.set_result(data)
+                data = loads(message)
+                try:
+                    request_id = data['id']
+                    future = pop_pending(request_id)
+                except KeyError:
+                    continue
+                pop_deadline(request_id, None)
+                future.set_result(data)
         except websockets.exceptions.ConnectionClosed:
             print("Connection to server closed")
         except Exception as e:
@@ -56,9 +90,10 @@ class ChromeTabController:
         if not self.websocket:
             raise ConnectionError("Not connected to server")
 
-        request_id = str(uuid.uuid4())
-        future = asyncio.Future()
+        request_id = uuid.uuid4().hex
+        future = self._loop.create_future()
         self.pending_requests[request_id] = future
+        self._deadlines[request_id] = self._loop.time() + 10.0
 
         message = {
             'type': 'command',
@@ -67,15 +102,40 @@ class ChromeTabController:
             'payload': payload or {}
         }
 
-        await self.websocket.send(json.dumps(message))
+        self._send_q.put_nowait(dumps(message))
 
         try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
+            return await future
         except asyncio.TimeoutError:
-            self.pending_requests.pop(request_id, None)
             return {'error': 'Request timeout'}
 
+    async def _writer(self):
+        """Drain queued frames on a single task so bursts of commands are
+        flushed back-to-back instead of one scheduler wakeup per send."""
+        while self.websocket:
+            batch = [await self._send_q.get()]
+            while not self._send_q.empty():
+                batch.append(self._send_q.get_nowait())
+            for text in batch:
+                try:
+                    await self.websocket.send(text)
+                except websockets.exceptions.ConnectionClosed:
+                    print("Connection closed before message could be sent")
+                    return
+
+    async def _sweep_expired(self):
+        """Time out stale requests with one periodic sweep instead of a
+        per-command asyncio.wait_for wrapper (extra task + timer handle)."""
+        while self.websocket:
+            await asyncio.sleep(1)
+            now = self._loop.time()
+            expired = [rid for rid, deadline in self._deadlines.items() if deadline <= now]
+            for request_id in expired:
+                del self._deadlines[request_id]
+                future = self.pending_requests.pop(request_id, None)
+                if future and not future.done():
+                    future.set_exception(asyncio.TimeoutError())
+
     async def list_tabs(self) -> List[Dict]:
         """List all open Chrome tabs"""
         response = await self._send_command('list_tabs')
@@ -153,8 +213,8 @@ class ChromeTabController:
             print("No tabs found")
             return
 
-        print(f"\n{'ID':<8} {'Active':<8} {'Title':<30} {'URL'}")
-        print("-" * 80)
+        # Build the whole table and write it once instead of a print per row
+        lines = [f"\n{'ID':<8} {'Active':<8} {'Title':<30} {'URL'}", "-" * 80]
 
         for tab in tabs:
             tab_id = tab.get('id', 'N/A')
@@ -162,15 +222,86 @@ class ChromeTabController:
             title = tab.get('title', 'No Title')[:30]
             url = tab.get('url', 'No URL')[:40]
 
-            print(f"{tab_id:<8} {active:<8} {title:<30} {url}")
+            lines.append(f"{tab_id:<8} {active:<8} {title:<30} {url}")
+
+        print("\n".join(lines))
 
     async def disconnect(self):
-        """Close the connection"""
+        """Close the connection and stop the background tasks"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
 
 # Interactive CLI
+_HAS_SCHEME = re.compile(r'^https?://').match
+
+def _ensure_scheme(url: str) -> str:
+    """Default bare hostnames to https://"""
+    if not _HAS_SCHEME(url):
+        url = 'https://' + url
+    return url
+
+
+async def _cli_list(controller, args):
+    tabs = await controller.list_tabs()
+    controller.print_tabs(tabs)
+
+async def _cli_open(controller, args):
+    url = _ensure_scheme(args[0])
+    tab = await controller.open_tab(url)
+    if tab:
+        print(f"Opened tab {tab.get('id')} with URL: {url}")
+
+async def _cli_close(controller, args):
+    try:
+        tab_id = int(args[0])
+        if await controller.close_tab(tab_id):
+            print(f"Closed tab {tab_id}")
+    except ValueError:
+        print("Invalid tab ID")
+
+async def _cli_switch(controller, args):
+    try:
+        tab_id = int(args[0])
+        if await controller.switch_tab(tab_id):
+            print(f"Switched to tab {tab_id}")
+    except ValueError:
+        print("Invalid tab ID")
+
+async def _cli_reload(controller, args):
+    try:
+        tab_id = int(args[0])
+        if await controller.reload_tab(tab_id):
+            print(f"Reloaded tab {tab_id}")
+    except ValueError:
+        print("Invalid tab ID")
+
+async def _cli_nav(controller, args):
+    try:
+        tab_id = int(args[0])
+        url = _ensure_scheme(args[1])
+        if await controller.navigate_tab(tab_id, url):
+            print(f"Navigated tab {tab_id} to {url}")
+    except ValueError:
+        print("Invalid tab ID")
+
+# (handler, minimum argument count) per command
+_CLI_HANDLERS = {
+    'list': (_cli_list, 0),
+    'open': (_cli_open, 1),
+    'close': (_cli_close, 1),
+    'switch': (_cli_switch, 1),
+    'reload': (_cli_reload, 1),
+    'nav': (_cli_nav, 2),
+}
+
+
 async def interactive_mode():
     """Interactive command-line interface"""
     controller = ChromeTabController()
@@ -189,8 +320,12 @@ async def interactive_mode():
         print("  quit         - Exit")
         print()
 
+        loop = asyncio.get_running_loop()
+
         while True:
-            command = input("chrome> ").strip().split()
+            # input() would block the loop and stall the message handler,
+            # sweeper and keepalives while the user types
+            command = (await loop.run_in_executor(None, input, "chrome> ")).strip().split()
 
             if not command:
                 continue
@@ -199,47 +334,10 @@ async def interactive_mode():
 
             if cmd == 'quit' or cmd == 'exit':
                 break
-            elif cmd == 'list':
-                tabs = await controller.list_tabs()
-                controller.print_tabs(tabs)
-            elif cmd == 'open' and len(command) > 1:
-                url = command[1]
-                if not url.startswith(('http://', 'https://')):
-                    url = 'https://' + url
-                tab = await controller.open_tab(url)
-                if tab:
-                    print(f"Opened tab {tab.get('id')} with URL: {url}")
-            elif cmd == 'close' and len(command) > 1:
-                try:
-                    tab_id = int(command[1])
-                    if await controller.close_tab(tab_id):
-                        print(f"Closed tab {tab_id}")
-                except ValueError:
-                    print("Invalid tab ID")
-            elif cmd == 'switch' and len(command) > 1:
-                try:
-                    tab_id = int(command[1])
-                    if await controller.switch_tab(tab_id):
-                        print(f"Switched to tab {tab_id}")
-                except ValueError:
-                    print("Invalid tab ID")
-            elif cmd == 'reload' and len(command) > 1:
-                try:
-                    tab_id = int(command[1])
-                    if await controller.reload_tab(tab_id):
-                        print(f"Reloaded tab {tab_id}")
-                except ValueError:
-                    print("Invalid tab ID")
-            elif cmd == 'nav' and len(command) > 2:
-                try:
-                    tab_id = int(command[1])
-                    url = command[2]
-                    if not url.startswith(('http://', 'https://')):
-                        url = 'https://' + url
-                    if await controller.navigate_tab(tab_id, url):
-                        print(f"Navigated tab {tab_id} to {url}")
-                except ValueError:
-                    print("Invalid tab ID")
+
+            handler, min_args = _CLI_HANDLERS.get(cmd, (None, 0))
+            if handler and len(command) > min_args:
+                await handler(controller, command[1:])
             else:
                 print("Invalid command or missing arguments")
 
@@ -258,10 +356,12 @@ async def automation_example():
 
         print("Opening some example tabs...")
 
-        # Open some tabs
-        await controller.open_tab("https://github.com", active=False)
-        await controller.open_tab("https://stackoverflow.com", active=False)
-        await controller.open_tab("https://docs.python.org", active=True)
+        # Open some tabs concurrently; request ids keep responses correlated
+        await asyncio.gather(
+            controller.open_tab("https://github.com", active=False),
+            controller.open_tab("https://stackoverflow.com", active=False),
+            controller.open_tab("https://docs.python.org", active=True)
+        )
 
         await asyncio.sleep(2)
 
@@ -278,14 +378,17 @@ async def automation_example():
 
         await asyncio.sleep(2)
 
-        # Close tabs with specific patterns
+        # Close tabs with specific patterns, all in one round trip
         print("\nClosing GitHub and StackOverflow tabs...")
         tabs = await controller.list_tabs()
-        for tab in tabs:
-            url = tab.get('url', '').lower()
-            if 'github.com' in url or 'stackoverflow.com' in url:
-                await controller.close_tab(tab['id'])
-                print(f"Closed: {tab.get('title')}")
+        to_close = [
+            tab for tab in tabs
+            if 'github.com' in tab.get('url', '').lower()
+            or 'stackoverflow.com' in tab.get('url', '').lower()
+        ]
+        await asyncio.gather(*(controller.close_tab(tab['id']) for tab in to_close))
+        for tab in to_close:
+            print(f"Closed: {tab.get('title')}")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -295,6 +398,12 @@ async def automation_example():
 if __name__ == "__main__":
     import sys
 
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     if len(sys.argv) > 1 and sys.argv[1] == "demo":
         asyncio.run(automation_example())
     else:
@@ -12,17 +12,42 @@ from typing import Dict, Any, Optional, List
 import uuid
 from datetime import datetime
 
+# Prefer orjson for the per-frame envelope encode/decode; fall back to the
+# stdlib so the dependency stays optional. Extension-bound frames must stay
+# text (str) because background.js runs JSON.parse on ev.data; frames to the
+# Python client go out as bytes (BINARY), skipping the UTF-8 text-frame
+# validation on both sides. loads accepts str and bytes alike.
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    dumps_bytes = orjson.dumps
+    loads = orjson.loads
+except ImportError:
+    dumps = json.dumps
+    dumps_bytes = json.dumps
+    loads = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MCPChromeServer:
+    __slots__ = ('host', 'port', 'extension_connection', 'client_connections',
+                 'pending_requests', '_deadlines', '_send_q', '_loop', '_tasks')
+
     def __init__(self, host='localhost', port=8765):
         self.host = host
         self.port = port
         self.extension_connection = None
         self.client_connections = set()
         self.pending_requests = {}
+        self._deadlines = {}
+        self._send_q = asyncio.Queue()
+        self._loop = None
+        self._tasks = []
 
     async def handle_connection(self, websocket):
         """Handle new WebSocket connections"""
@@ -41,7 +66,7 @@ class MCPChromeServer:
     async def handle_message(self, websocket, message):
         """Process incoming messages"""
         try:
-            data = json.loads(message)
+            data = loads(message)
             msg_type = data.get('type')
 
             if msg_type == 'role':
@@ -77,12 +102,21 @@ class MCPChromeServer:
                 'id': data.get('id'),
                 'error': 'Chrome extension not connected'
             }
-            await websocket.send(json.dumps(error_response))
+            self._queue_send(websocket, dumps_bytes(error_response))
             return
 
-        # Forward command to extension and track the request
-        request_id = data.get('id') or str(uuid.uuid4())
-        self.pending_requests[request_id] = websocket
+        # Forward command to extension and track the request. The pending
+        # entry is always a Future (same shape as the MCP tool methods); a
+        # done-callback relays the result back to the requesting client.
+        request_id = data.get('id') or uuid.uuid4().hex
+        future = self._loop.create_future()
+
+        def _relay(fut):
+            if not fut.cancelled() and fut.exception() is None:
+                self._queue_send(websocket, dumps_bytes(fut.result()))
+
+        future.add_done_callback(_relay)
+        self._track_request(request_id, future)
 
         command_msg = {
             'type': 'command',
@@ -91,192 +125,163 @@ class MCPChromeServer:
             'payload': data.get('payload', {})
         }
 
-        await self.extension_connection.send(json.dumps(command_msg))
+        self._queue_send(self.extension_connection, dumps(command_msg))
+
+    def _queue_send(self, websocket, text):
+        """Hand an encoded frame to the writer task"""
+        self._send_q.put_nowait((websocket, text))
+
+    async def _writer(self):
+        """Drain queued frames on a single task.
+
+        Producers enqueue instead of awaiting websocket.send directly, so
+        bursts are flushed back-to-back without a scheduler round trip per
+        message. Frames for a since-closed connection are dropped with a
+        warning; the sweeper times out whatever was in flight.
+        """
+        while True:
+            batch = [await self._send_q.get()]
+            while not self._send_q.empty():
+                batch.append(self._send_q.get_nowait())
+            for websocket, text in batch:
+                try:
+                    await websocket.send(text)
+                except websockets.exceptions.ConnectionClosed:
+                    logger.warning("Connection closed before message could be sent")
 
     async def handle_response(self, data):
         """Handle responses from the extension"""
-        request_id = data.get('id')
-        if request_id in self.pending_requests:
-            client_ws = self.pending_requests.pop(request_id)
-            try:
-                await client_ws.send(json.dumps(data))
-            except websockets.exceptions.ConnectionClosed:
-                logger.warning(f"Client connection closed before response could be sent")
+        try:
+            request_id = data['id']
+            future = self.pending_requests.pop(request_id)
+        except KeyError:
+            return
+        self._deadlines.pop(request_id, None)
+        if not future.done():
+            future.set_result(data)
+
+    def _track_request(self, request_id, future, timeout=10.0):
+        """Register an in-flight request and its expiry for the sweeper"""
+        self.pending_requests[request_id] = future
+        self._deadlines[request_id] = self._loop.time() + timeout
+
+    async def _sweep_expired(self):
+        """Time out stale pending requests in one place.
+
+        A single periodic sweep replaces a per-command asyncio.wait_for,
+        which costs an extra task plus a timer handle on every request.
+        """
+        while True:
+            await asyncio.sleep(1)
+            now = self._loop.time()
+            expired = [rid for rid, deadline in self._deadlines.items() if deadline <= now]
+            for request_id in expired:
+                del self._deadlines[request_id]
+                future = self.pending_requests.pop(request_id, None)
+                if future and not future.done():
+                    future.set_exception(asyncio.TimeoutError())
 
     async def cleanup_connection(self, websocket):
         """Clean up when a connection is closed"""
         if websocket == self.extension_connection:
             self.extension_connection = None
             logger.info("Chrome extension disconnected")
+
+            # No responses can arrive anymore; cancel everything in flight
+            for future in self.pending_requests.values():
+                if not future.done():
+                    future.cancel()
+            self.pending_requests.clear()
+            self._deadlines.clear()
         elif websocket in self.client_connections:
             self.client_connections.remove(websocket)
             logger.info(f"Client disconnected. Remaining clients: {len(self.client_connections)}")
 
-        # Remove any pending requests for this websocket
-        to_remove = [req_id for req_id, ws in self.pending_requests.items() if ws == websocket]
-        for req_id in to_remove:
-            del self.pending_requests[req_id]
-
     # MCP Tool Methods
-    async def list_tabs(self) -> Dict[str, Any]:
-        """List all open tabs"""
+    async def _invoke(self, command: str, payload: Optional[Dict] = None,
+                      timeout: float = 10.0) -> Dict[str, Any]:
+        """Send one command to the extension and await its response.
+
+        The six public tool methods were identical except for the command
+        name and payload; this is the single copy of that request/response
+        plumbing.
+        """
         if not self.extension_connection:
             return {'error': 'Chrome extension not connected'}
 
-        request_id = str(uuid.uuid4())
-        command = {
+        request_id = uuid.uuid4().hex
+        message = {
             'type': 'command',
             'id': request_id,
-            'command': 'list_tabs'
+            'command': command,
+            'payload': payload or {}
         }
 
-        # Send command and wait for response
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
+        future = self._loop.create_future()
+        self._track_request(request_id, future, timeout)
 
-        await self.extension_connection.send(json.dumps(command))
+        self._queue_send(self.extension_connection, dumps(message))
 
         try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
+            return await future
         except asyncio.TimeoutError:
             return {'error': 'Request timeout'}
+        except asyncio.CancelledError:
+            return {'error': 'Chrome extension disconnected'}
+
+    async def list_tabs(self) -> Dict[str, Any]:
+        """List all open tabs"""
+        return await self._invoke('list_tabs')
 
     async def open_tab(self, url: str, active: bool = True) -> Dict[str, Any]:
         """Open a new tab with the specified URL"""
-        if not self.extension_connection:
-            return {'error': 'Chrome extension not connected'}
-
-        request_id = str(uuid.uuid4())
-        command = {
-            'type': 'command',
-            'id': request_id,
-            'command': 'open_tab',
-            'payload': {'url': url, 'active': active}
-        }
-
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        await self.extension_connection.send(json.dumps(command))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
-        except asyncio.TimeoutError:
-            return {'error': 'Request timeout'}
+        return await self._invoke('open_tab', {'url': url, 'active': active})
 
     async def close_tab(self, tab_id: int) -> Dict[str, Any]:
         """Close a tab by ID"""
-        if not self.extension_connection:
-            return {'error': 'Chrome extension not connected'}
-
-        request_id = str(uuid.uuid4())
-        command = {
-            'type': 'command',
-            'id': request_id,
-            'command': 'close_tab',
-            'payload': {'tabId': tab_id}
-        }
-
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        await self.extension_connection.send(json.dumps(command))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
-        except asyncio.TimeoutError:
-            return {'error': 'Request timeout'}
+        return await self._invoke('close_tab', {'tabId': tab_id})
 
     async def switch_tab(self, tab_id: int, window_id: Optional[int] = None) -> Dict[str, Any]:
         """Switch to a specific tab"""
-        if not self.extension_connection:
-            return {'error': 'Chrome extension not connected'}
-
-        request_id = str(uuid.uuid4())
         payload = {'tabId': tab_id}
         if window_id:
             payload['windowId'] = window_id
-
-        command = {
-            'type': 'command',
-            'id': request_id,
-            'command': 'switch_tab',
-            'payload': payload
-        }
-
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        await self.extension_connection.send(json.dumps(command))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
-        except asyncio.TimeoutError:
-            return {'error': 'Request timeout'}
+        return await self._invoke('switch_tab', payload)
 
     async def reload_tab(self, tab_id: int) -> Dict[str, Any]:
         """Reload a specific tab"""
-        if not self.extension_connection:
-            return {'error': 'Chrome extension not connected'}
-
-        request_id = str(uuid.uuid4())
-        command = {
-            'type': 'command',
-            'id': request_id,
-            'command': 'reload_tab',
-            'payload': {'tabId': tab_id}
-        }
-
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        await self.extension_connection.send(json.dumps(command))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
-        except asyncio.TimeoutError:
-            return {'error': 'Request timeout'}
+        return await self._invoke('reload_tab', {'tabId': tab_id})
 
     async def navigate_tab(self, tab_id: int, url: str) -> Dict[str, Any]:
         """Navigate a specific tab to a new URL"""
-        if not self.extension_connection:
-            return {'error': 'Chrome extension not connected'}
-
-        request_id = str(uuid.uuid4())
-        command = {
-            'type': 'command',
-            'id': request_id,
-            'command': 'navigate_tab',
-            'payload': {'tabId': tab_id, 'url': url}
-        }
-
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        await self.extension_connection.send(json.dumps(command))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=10.0)
-            return response
-        except asyncio.TimeoutError:
-            return {'error': 'Request timeout'}
+        return await self._invoke('navigate_tab', {'tabId': tab_id, 'url': url})
 
     async def start_server(self):
         """Start the WebSocket server"""
         logger.info(f"Starting MCP Chrome Server on {self.host}:{self.port}")
 
-        # Create the WebSocket server - path routing is handled in handle_connection
+        # create_future()/time() on the cached loop skip the running-loop
+        # lookup and use the loop's optimized future implementation
+        self._loop = asyncio.get_running_loop()
+
+        # Create the WebSocket server - path routing is handled in handle_connection.
+        # permessage-deflate is disabled: zlib costs more CPU than it saves in
+        # bandwidth on these small JSON envelopes.
         server = await websockets.serve(
             self.handle_connection,
             self.host,
-            self.port
+            self.port,
+            compression=None,
+            max_size=2**20,
+            ping_interval=30
         )
 
+        # Keep references so the loop's weak task set can't GC these
+        self._tasks = [
+            asyncio.create_task(self._sweep_expired(), name="ws-sweeper"),
+            asyncio.create_task(self._writer(), name="ws-writer"),
+        ]
+
         logger.info(f"MCP Chrome Server running on ws://{self.host}:{self.port}/ws")
         return server
 
@@ -294,4 +299,10 @@ async def main():
         await ws_server.wait_closed()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())